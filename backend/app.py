@@ -1,9 +1,14 @@
+from commands import register_commands
 from config import Config
 from controllers.auth_controller import AuthController
+from controllers.profiling_controller import ProfilingController
+from controllers.stats_controller import StatsController
 from controllers.subject_controller import SubjectController
 from controllers.task_controller import TaskController
 from extensions import cors, db
 from flask import Flask
+from sharding import create_shard_schemas
+from utils.profiling import init_profiling
 
 
 def create_app():
@@ -17,6 +22,7 @@ def create_app():
         resources={r"/*": {"origins": Config.CORS_ORIGINS}},
         supports_credentials=True,
     )
+    init_profiling(app)
 
     # Реєстрація маршрутів
     app.add_url_rule("/register", "register", AuthController.register, methods=["POST"])
@@ -27,6 +33,18 @@ def create_app():
     app.add_url_rule(
         "/tasks", "create_task", TaskController.create_task, methods=["POST"]
     )
+    app.add_url_rule(
+        "/tasks/import", "import_tasks", TaskController.import_tasks, methods=["POST"]
+    )
+    app.add_url_rule(
+        "/tasks/export", "export_tasks", TaskController.export_tasks, methods=["GET"]
+    )
+    app.add_url_rule(
+        "/tasks/plan", "get_plan", TaskController.get_plan, methods=["GET"]
+    )
+    app.add_url_rule(
+        "/tasks/search", "search_tasks", TaskController.search_tasks, methods=["GET"]
+    )
     app.add_url_rule(
         "/tasks/<int:task_id>",
         "update_task",
@@ -75,6 +93,25 @@ def create_app():
         methods=["DELETE"],
     )
 
+    # Stats routes
+    app.add_url_rule("/stats", "get_stats", StatsController.get_stats, methods=["GET"])
+
+    # Profiling routes
+    app.add_url_rule(
+        "/admin/profiles",
+        "get_profiles",
+        ProfilingController.get_profiles,
+        methods=["GET"],
+    )
+    app.add_url_rule(
+        "/admin/slow-queries",
+        "get_slow_queries",
+        ProfilingController.get_slow_queries,
+        methods=["GET"],
+    )
+
+    register_commands(app)
+
     return app
 
 
@@ -82,4 +119,5 @@ if __name__ == "__main__":
     app = create_app()
     with app.app_context():
         db.create_all()
+        create_shard_schemas(db)
     app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,70 @@
+import json
+
+import click
+from extensions import db
+from models.task_search import rebuild_task_search
+from models.user import User
+from services.profiling_service import ProfilingService
+from services.shard_service import ShardService
+from services.stats_service import StatsService
+from sharding import shard_for_user, shard_keys, use_shard
+from utils.exceptions import NotFoundError, ValidationError
+
+
+def register_commands(app):
+    @app.cli.command("move-user")
+    @click.argument("user_id", type=int)
+    @click.argument("target")
+    def move_user(user_id, target):
+        """Перенести дані користувача на інший шард ("default" — основна БД)."""
+        target_key = None if target == "default" else target
+        try:
+            result = ShardService.move_user(user_id, target_key)
+        except (NotFoundError, ValidationError) as e:
+            raise click.ClickException(str(e))
+        click.echo(
+            f"User {user_id}: {result['source'] or 'default'} -> "
+            f"{result['target'] or 'default'}, {result['rows']} rows moved"
+        )
+
+    @app.cli.command("list-shards")
+    def list_shards():
+        """Показати налаштовані шарди."""
+        for key in shard_keys():
+            click.echo(key)
+
+    @app.cli.command("rebuild-stats")
+    @click.option("--user-id", type=int, default=None)
+    def rebuild_stats(user_id):
+        """Перерахувати лічильники статистики з таблиці tasks."""
+        if user_id is not None:
+            user = db.session.get(User, user_id)
+            if not user:
+                raise click.ClickException("User not found")
+            shards = [shard_for_user(user)]
+        else:
+            shards = [None, *shard_keys()]
+
+        for shard_key in shards:
+            use_shard(shard_key)
+            rows = StatsService.rebuild(user_id)
+            click.echo(f"{shard_key or 'default'}: {rows} counter rows rebuilt")
+
+    @app.cli.command("dump-profiles")
+    @click.option("--slow-queries", is_flag=True, help="Показати повільні запити.")
+    @click.option("--limit", type=int, default=20)
+    def dump_profiles(slow_queries, limit):
+        """Вивести збережені профілі запитів або повільні SQL-запити."""
+        if slow_queries:
+            records = ProfilingService.get_slow_queries(limit)
+        else:
+            records = ProfilingService.get_profiles(limit)
+        click.echo(json.dumps(records, indent=2, ensure_ascii=False))
+
+    @app.cli.command("rebuild-search")
+    def rebuild_search():
+        """Створити та заново наповнити повнотекстовий індекс завдань."""
+        for shard_key in [None, *shard_keys()]:
+            with db.engines[shard_key].begin() as connection:
+                rebuild_task_search(connection)
+            click.echo(f"{shard_key or 'default'}: search index rebuilt")
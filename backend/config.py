@@ -4,8 +4,32 @@ import os
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///db.sqlite")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Бази-шарди з даними користувачів; без них усе зберігається в DATABASE_URL
+    SQLALCHEMY_BINDS = {
+        f"shard_{index}": url.strip()
+        for index, url in enumerate(
+            filter(None, os.getenv("SHARD_DATABASE_URLS", "").split(","))
+        )
+    }
+    # Пауза між позначкою "переноситься" і копіюванням, щоб завершилися
+    # запити, які вже маршрутизовано на старий шард
+    SHARD_MOVE_DRAIN_SECONDS = float(os.getenv("SHARD_MOVE_DRAIN_SECONDS", 5))
     SECRET_KEY = os.getenv("JWT_SECRET", "super-secret-key")
     JWT_EXPIRATION_HOURS = int(os.getenv("JWT_EXPIRATION_HOURS", 24))
     CORS_ORIGINS = os.getenv(
         "CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000"
     ).split(",")
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 1000))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+    SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", 20))
+    PLAN_HOURS_PER_DAY = float(os.getenv("PLAN_HOURS_PER_DAY", 4))
+    PLAN_CACHE_TTL = int(os.getenv("PLAN_CACHE_TTL", 300))
+    # Межі кешу планів: кількість користувачів і варіантів hours_per_day на кожного
+    PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", 1000))
+    PLAN_CACHE_VARIANTS = int(os.getenv("PLAN_CACHE_VARIANTS", 8))
+    SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", 100))
+    # Профілювання вимкнене, доки не задано токен оператора або частку запитів
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_TOP_FRAMES = int(os.getenv("PROFILE_TOP_FRAMES", 30))
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 0))
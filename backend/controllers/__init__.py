@@ -1,5 +1,13 @@
 from .auth_controller import AuthController
+from .profiling_controller import ProfilingController
+from .stats_controller import StatsController
 from .subject_controller import SubjectController
 from .task_controller import TaskController
 
-__all__ = ["AuthController", "TaskController", "SubjectController"]
+__all__ = [
+    "AuthController",
+    "TaskController",
+    "SubjectController",
+    "StatsController",
+    "ProfilingController",
+]
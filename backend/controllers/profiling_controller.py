@@ -0,0 +1,23 @@
+from flask import jsonify, request
+from services.profiling_service import ProfilingService
+from utils.decorators import operator_required
+
+
+class ProfilingController:
+    @staticmethod
+    @operator_required
+    def get_profiles():
+        try:
+            limit = request.args.get("limit", 20, type=int)
+            return jsonify(ProfilingService.get_profiles(limit)), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @operator_required
+    def get_slow_queries():
+        try:
+            limit = request.args.get("limit", 50, type=int)
+            return jsonify(ProfilingService.get_slow_queries(limit)), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
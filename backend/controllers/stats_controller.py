@@ -0,0 +1,18 @@
+from flask import jsonify
+from services.stats_service import StatsService
+from utils.decorators import token_required
+
+
+class StatsController:
+    @staticmethod
+    @token_required
+    def get_stats(current_user):
+        try:
+            subjects = StatsService.get_stats(current_user.id)
+            totals = {
+                key: sum(subject[key] for subject in subjects)
+                for key in ("open", "completed", "overdue", "load")
+            }
+            return jsonify({"subjects": subjects, "totals": totals}), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
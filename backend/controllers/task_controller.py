@@ -1,8 +1,18 @@
-from flask import jsonify, request
+from flask import Response, jsonify, request, stream_with_context
+from config import Config
+from recommendations.planner import StudyPlanner
 from recommendations.topsis import TOPSIS
+from services.search_service import SearchService
 from services.task_service import TaskService
 from utils.decorators import token_required
 from utils.exceptions import NotFoundError, ValidationError
+from utils.task_io import (
+    BODY_MIMETYPES,
+    FORMAT_MIMETYPES,
+    read_task_rows,
+    resolve_format,
+    write_task_rows,
+)
 from utils.validators import validate_task_data
 
 
@@ -177,3 +187,116 @@ class TaskController:
             )
         except Exception as e:
             return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @token_required
+    def import_tasks(current_user):
+        try:
+            if request.mimetype == "multipart/form-data":
+                upload = request.files.get("file")
+                if not upload:
+                    return jsonify({"error": "File is required"}), 400
+                fmt_hint = request.args.get("format")
+                if not fmt_hint and (upload.filename or "").lower().endswith(".csv"):
+                    fmt_hint = "csv"
+                fmt = resolve_format(fmt_hint, upload.mimetype)
+                stream = upload.stream
+            else:
+                # Інші типи (напр., form-urlencoded) Werkzeug розбирає як форму
+                # і тіло вже не прочитати — відхиляємо замість "imported: 0"
+                if request.mimetype and request.mimetype not in BODY_MIMETYPES:
+                    raise ValidationError(
+                        f"Unsupported content type: {request.mimetype}. "
+                        "Send an ndjson/csv body or multipart/form-data"
+                    )
+                fmt = resolve_format(request.args.get("format"), request.content_type)
+                stream = request.stream
+
+            result = TaskService.import_tasks(
+                current_user.id, read_task_rows(stream, fmt)
+            )
+            return jsonify({"message": "Tasks imported", **result}), 201
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @token_required
+    def export_tasks(current_user):
+        try:
+            fmt = resolve_format(request.args.get("format"))
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+
+        rows = TaskService.export_tasks(current_user.id)
+        return Response(
+            stream_with_context(write_task_rows(rows, fmt)),
+            mimetype=FORMAT_MIMETYPES[fmt],
+            headers={
+                "Content-Disposition": f"attachment; filename=tasks.{fmt}",
+            },
+        )
+
+    @staticmethod
+    @token_required
+    def search_tasks(current_user):
+        try:
+            query = request.args.get("q", "").strip()
+            if not query:
+                return jsonify({"error": "Query is required"}), 400
+
+            page = max(request.args.get("page", 1, type=int), 1)
+            per_page = min(
+                max(request.args.get("per_page", Config.SEARCH_PAGE_SIZE, type=int), 1),
+                Config.SEARCH_MAX_PAGE_SIZE,
+            )
+
+            tasks, has_more = SearchService.search_tasks(
+                current_user.id, query, page, per_page
+            )
+            return (
+                jsonify(
+                    {
+                        "query": query,
+                        "page": page,
+                        "per_page": per_page,
+                        "has_more": has_more,
+                        "tasks": [
+                            {
+                                "id": task.id,
+                                "task_name": task.task_name,
+                                "subject_id": task.subject_id,
+                                "subject_name": task.subject_name,
+                                "priority": task.priority,
+                                "difficulty": task.difficulty,
+                                "deadline": task.deadline.isoformat(),
+                                "is_completed": task.is_completed,
+                                "rank": task.rank,
+                            }
+                            for task in tasks
+                        ],
+                    }
+                ),
+                200,
+            )
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @staticmethod
+    @token_required
+    def get_plan(current_user):
+        try:
+            try:
+                hours_per_day = float(
+                    request.args.get("hours_per_day", Config.PLAN_HOURS_PER_DAY)
+                )
+            except ValueError:
+                return jsonify({"error": "hours_per_day must be a number"}), 400
+            # Порівняння відсіює й nan: воно завжди хибне
+            if not 0 < hours_per_day <= 24:
+                return jsonify({"error": "hours_per_day must be between 0 and 24"}), 400
+
+            return jsonify(StudyPlanner.plan(current_user.id, hours_per_day)), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
@@ -1,5 +1,6 @@
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from sharding import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 cors = CORS()
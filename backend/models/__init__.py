@@ -1,5 +1,20 @@
+from .request_profile import RequestProfile
+from .slow_query import SlowQuery
 from .subject import Subject
+from .subject_stats import SubjectStats
 from .task import Task
+from .task_search import install_task_search, rebuild_task_search
 from .user import User
+from .user_shard import UserShard
 
-__all__ = ["User", "Subject", "Task"]
+__all__ = [
+    "User",
+    "UserShard",
+    "Subject",
+    "SubjectStats",
+    "Task",
+    "RequestProfile",
+    "SlowQuery",
+    "install_task_search",
+    "rebuild_task_search",
+]
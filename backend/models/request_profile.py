@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from extensions import db
+
+
+class RequestProfile(db.Model):
+    __tablename__ = "request_profiles"
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    method = db.Column(db.String(10), nullable=False)
+    path = db.Column(db.String(500), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    duration_ms = db.Column(db.Float, nullable=False)
+    frames = db.Column(db.JSON, nullable=False)
+
+    def __repr__(self):
+        return f"<RequestProfile {self.method} {self.path}>"
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from extensions import db
+
+
+class SlowQuery(db.Model):
+    __tablename__ = "slow_queries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    path = db.Column(db.String(500))
+    duration_ms = db.Column(db.Float, nullable=False)
+    statement = db.Column(db.Text, nullable=False)
+    parameters = db.Column(db.JSON)
+    plan = db.Column(db.JSON)
+
+    def __repr__(self):
+        return f"<SlowQuery {self.duration_ms:.1f}ms>"
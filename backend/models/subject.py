@@ -3,6 +3,7 @@ from extensions import db
 
 class Subject(db.Model):
     __tablename__ = "subjects"
+    __table_args__ = {"info": {"sharded": True}}
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -0,0 +1,15 @@
+from extensions import db
+
+
+class SubjectStats(db.Model):
+    __tablename__ = "subject_stats"
+    __table_args__ = {"info": {"sharded": True}}
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    subject_id = db.Column(db.Integer, db.ForeignKey("subjects.id"), primary_key=True)
+    open_count = db.Column(db.Integer, default=0, nullable=False)
+    completed_count = db.Column(db.Integer, default=0, nullable=False)
+    open_load = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<SubjectStats {self.user_id}/{self.subject_id}>"
@@ -1,9 +1,15 @@
-
 from extensions import db
 
+# Вага (оцінка годин) складності: спільна для TOPSIS, лічильників і планувальника
+DIFFICULTY_WEIGHTS = {"Easy": 1, "Medium": 3, "Hard": 5}
+
 
 class Task(db.Model):
     __tablename__ = "tasks"
+    __table_args__ = (
+        db.Index("ix_tasks_user_open_deadline", "user_id", "is_completed", "deadline"),
+        {"info": {"sharded": True}},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     task_name = db.Column(db.String(200), nullable=False)
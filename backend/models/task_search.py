@@ -0,0 +1,150 @@
+from sqlalchemy import event, text
+
+from models.task import Task
+
+# Повнотекстовий індекс за назвами завдань і предметів. Він живе поза
+# metadata (у SQLite це віртуальна таблиця FTS5) і синхронізується тригерами,
+# тож будь-який запис у tasks/subjects — зокрема масовий імпорт і перенесення
+# між шардами — одразу потрапляє в індекс.
+SEARCH_DDL = {
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5(
+            owner, task_name, subject_name,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS task_search_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO task_search (rowid, owner, task_name, subject_name)
+            VALUES (
+                new.id,
+                'u' || new.user_id,
+                new.task_name,
+                (SELECT name FROM subjects WHERE id = new.subject_id)
+            );
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS task_search_update
+        AFTER UPDATE OF task_name, subject_id, user_id ON tasks
+        BEGIN
+            UPDATE task_search SET
+                owner = 'u' || new.user_id,
+                task_name = new.task_name,
+                subject_name = (SELECT name FROM subjects WHERE id = new.subject_id)
+            WHERE rowid = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS task_search_delete AFTER DELETE ON tasks
+        BEGIN
+            DELETE FROM task_search WHERE rowid = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS task_search_subject_update
+        AFTER UPDATE OF name ON subjects
+        BEGIN
+            UPDATE task_search SET subject_name = new.name
+            WHERE rowid IN (SELECT id FROM tasks WHERE subject_id = new.id);
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE TABLE IF NOT EXISTS task_search (
+            task_id INTEGER PRIMARY KEY REFERENCES tasks (id) ON DELETE CASCADE,
+            user_id INTEGER NOT NULL,
+            document TSVECTOR NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_task_search_document "
+        "ON task_search USING GIN (document)",
+        "CREATE INDEX IF NOT EXISTS ix_task_search_user_id ON task_search (user_id)",
+        """
+        CREATE OR REPLACE FUNCTION task_search_document(task_name TEXT, subject_name TEXT)
+        RETURNS TSVECTOR AS $$
+            SELECT setweight(to_tsvector('simple', coalesce(task_name, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(subject_name, '')), 'B')
+        $$ LANGUAGE SQL IMMUTABLE
+        """,
+        """
+        CREATE OR REPLACE FUNCTION task_search_sync() RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO task_search (task_id, user_id, document)
+            VALUES (
+                NEW.id,
+                NEW.user_id,
+                task_search_document(
+                    NEW.task_name,
+                    (SELECT name FROM subjects WHERE id = NEW.subject_id)
+                )
+            )
+            ON CONFLICT (task_id) DO UPDATE
+                SET user_id = EXCLUDED.user_id, document = EXCLUDED.document;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS task_search_sync ON tasks",
+        """
+        CREATE TRIGGER task_search_sync
+        AFTER INSERT OR UPDATE OF task_name, subject_id, user_id ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_search_sync()
+        """,
+        """
+        CREATE OR REPLACE FUNCTION task_search_subject_sync() RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE task_search SET document = task_search_document(tasks.task_name, NEW.name)
+            FROM tasks
+            WHERE tasks.id = task_search.task_id AND tasks.subject_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS task_search_subject_sync ON subjects",
+        """
+        CREATE TRIGGER task_search_subject_sync
+        AFTER UPDATE OF name ON subjects
+        FOR EACH ROW EXECUTE FUNCTION task_search_subject_sync()
+        """,
+    ],
+}
+
+SEARCH_REBUILD = {
+    "sqlite": [
+        "DELETE FROM task_search",
+        """
+        INSERT INTO task_search (rowid, owner, task_name, subject_name)
+        SELECT tasks.id, 'u' || tasks.user_id, tasks.task_name, subjects.name
+        FROM tasks JOIN subjects ON subjects.id = tasks.subject_id
+        """,
+    ],
+    "postgresql": [
+        "TRUNCATE task_search",
+        """
+        INSERT INTO task_search (task_id, user_id, document)
+        SELECT tasks.id, tasks.user_id, task_search_document(tasks.task_name, subjects.name)
+        FROM tasks JOIN subjects ON subjects.id = tasks.subject_id
+        """,
+    ],
+}
+
+
+def install_task_search(connection):
+    for statement in SEARCH_DDL.get(connection.dialect.name, []):
+        connection.execute(text(statement))
+
+
+def rebuild_task_search(connection):
+    install_task_search(connection)
+    for statement in SEARCH_REBUILD.get(connection.dialect.name, []):
+        connection.execute(text(statement))
+
+
+@event.listens_for(Task.__table__, "after_create")
+def _create_task_search(target, connection, **kwargs):
+    install_task_search(connection)
@@ -3,6 +3,7 @@ from extensions import db
 
 class User(db.Model):
     __tablename__ = "users"
+    __table_args__ = {"info": {"shard_replica": True}}
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -12,6 +13,13 @@ class User(db.Model):
         "Subject", back_populates="user", cascade="all, delete-orphan"
     )
     tasks = db.relationship("Task", back_populates="user", cascade="all, delete-orphan")
+    shard = db.relationship(
+        "UserShard",
+        back_populates="user",
+        uselist=False,
+        lazy="joined",
+        cascade="all, delete-orphan",
+    )
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -0,0 +1,16 @@
+from extensions import db
+
+
+class UserShard(db.Model):
+    __tablename__ = "user_shards"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    # NULL — основна БД; рядок потрібен і тоді, коли користувача переносять
+    shard_key = db.Column(db.String(50), nullable=True)
+    # Поки дані переносяться між шардами, запити на зміну відхиляються
+    moving = db.Column(db.Boolean, default=False, nullable=False)
+
+    user = db.relationship("User", back_populates="shard")
+
+    def __repr__(self):
+        return f"<UserShard {self.user_id} -> {self.shard_key or 'default'}>"
@@ -1,3 +1,4 @@
+from .planner import StudyPlanner
 from .topsis import TOPSIS
 
-__all__ = ["TOPSIS"]
+__all__ = ["TOPSIS", "StudyPlanner"]
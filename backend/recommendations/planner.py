@@ -0,0 +1,214 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from config import Config
+from extensions import db
+from models.subject import Subject
+from models.task import DIFFICULTY_WEIGHTS, Task
+from recommendations.topsis import TOPSIS
+from sqlalchemy import select
+
+PLAN_COLUMNS = (
+    Task.id,
+    Task.task_name,
+    Task.subject_id,
+    Subject.name.label("subject_name"),
+    Task.priority,
+    Task.difficulty,
+    Task.deadline,
+)
+
+# Стан планувальника для кожного користувача в межах процесу (LRU):
+# впорядковані ключі EDF, параметри TOPSIS і вже пораховані плани.
+# Глобальний замок захищає лише сам словник; запити до БД і TOPSIS
+# виконуються під замком конкретного користувача
+_states = OrderedDict()
+_lock = threading.Lock()
+
+
+class _PlanState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.day = None
+        self.built_at = 0.0
+        self.model = None
+        self.entries = {}
+        self.order = []
+        self.dirty = set()
+        self.plans = {}
+
+    def reset(self, day, model):
+        self.day = day
+        self.built_at = time.monotonic()
+        self.model = model
+        self.entries = {}
+        self.order = []
+        self.dirty.clear()
+        self.plans.clear()
+
+    def add(self, row, score, keep_order=True):
+        # Найближчий дедлайн першим, при рівності — вищий бал TOPSIS
+        task_id, task_name, subject_id, subject_name, _, difficulty, deadline = row
+        key = (deadline, -float(score), task_id)
+        self.entries[task_id] = (
+            key,
+            {
+                "id": task_id,
+                "task_name": task_name,
+                "subject_id": subject_id,
+                "subject_name": subject_name,
+                "deadline": deadline.isoformat(),
+            },
+            DIFFICULTY_WEIGHTS[difficulty],
+        )
+        if keep_order:
+            bisect.insort(self.order, key)
+        else:
+            self.order.append(key)
+
+    def remove(self, task_id):
+        if entry := self.entries.pop(task_id, None):
+            del self.order[bisect.bisect_left(self.order, entry[0])]
+
+
+class StudyPlanner:
+    @staticmethod
+    def plan(user_id, hours_per_day):
+        today = date.today()
+        state = StudyPlanner._state(user_id)
+        with state.lock:
+            # TTL обмежує застарілість, якщо дані змінив інший процес
+            # (інший воркер або перенесення користувача між шардами)
+            if (
+                state.day != today
+                or time.monotonic() - state.built_at > Config.PLAN_CACHE_TTL
+            ):
+                StudyPlanner._build_state(state, user_id, today)
+            elif state.dirty:
+                StudyPlanner._refresh(state, user_id)
+
+            if hours_per_day not in state.plans:
+                if len(state.plans) >= Config.PLAN_CACHE_VARIANTS:
+                    del state.plans[next(iter(state.plans))]
+                state.plans[hours_per_day] = StudyPlanner._schedule(
+                    state, today, hours_per_day
+                )
+            return state.plans[hours_per_day]
+
+    @staticmethod
+    def task_changed(user_id, task_id):
+        # Змінене завдання буде перечитане й вставлене на своє місце при
+        # наступному запиті плану, без повного перерахунку
+        with _lock:
+            state = _states.get(user_id)
+        if state:
+            with state.lock:
+                state.dirty.add(task_id)
+                state.plans.clear()
+
+    @staticmethod
+    def invalidate(user_id):
+        with _lock:
+            _states.pop(user_id, None)
+
+    @staticmethod
+    def _state(user_id):
+        with _lock:
+            state = _states.get(user_id)
+            if state is None:
+                state = _states[user_id] = _PlanState()
+                while len(_states) > Config.PLAN_CACHE_SIZE:
+                    _states.popitem(last=False)
+            else:
+                _states.move_to_end(user_id)
+            return state
+
+    @staticmethod
+    def _open_tasks(user_id):
+        return (
+            select(*PLAN_COLUMNS)
+            .join(Subject, Subject.id == Task.subject_id)
+            .where(Task.user_id == user_id, Task.is_completed.is_(False))
+        )
+
+    @staticmethod
+    def _build_state(state, user_id, today):
+        rows = db.session.execute(StudyPlanner._open_tasks(user_id)).all()
+        if not rows:
+            state.reset(today, None)
+            return
+
+        decision_matrix = TOPSIS.build_matrix(rows)
+        model = TOPSIS.fit(decision_matrix)
+        state.reset(today, model)
+        for row, score in zip(rows, TOPSIS.closeness(decision_matrix, model)):
+            state.add(row, score, keep_order=False)
+        state.order.sort()
+
+    @staticmethod
+    def _refresh(state, user_id):
+        rows = db.session.execute(
+            StudyPlanner._open_tasks(user_id).where(Task.id.in_(state.dirty))
+        ).all()
+        for task_id in state.dirty:
+            state.remove(task_id)
+        state.dirty.clear()
+
+        if rows and state.model is None:
+            # Раніше відкритих завдань не було — нема з чим порівнювати
+            state.model = TOPSIS.fit(TOPSIS.build_matrix(rows))
+        if rows:
+            # Бал змінених завдань рахується відносно збережених еталонів TOPSIS
+            scores = TOPSIS.closeness(TOPSIS.build_matrix(rows), state.model)
+            for row, score in zip(rows, scores):
+                state.add(row, score)
+
+    @staticmethod
+    def _schedule(state, today, hours_per_day):
+        days = []
+        infeasible = []
+        day_index, free = 0, hours_per_day
+
+        for key in state.order:
+            _, task, remaining = state.entries[key[2]]
+            while remaining > 1e-9:
+                if free <= 1e-9:
+                    day_index, free = day_index + 1, hours_per_day
+                while len(days) <= day_index:
+                    days.append([])
+
+                hours = min(remaining, free)
+                days[day_index].append({**task, "hours": float(round(hours, 2))})
+                remaining -= hours
+                free -= hours
+
+            days_late = day_index - (key[0] - today).days
+            if days_late > 0:
+                infeasible.append(
+                    {
+                        "id": task["id"],
+                        "task_name": task["task_name"],
+                        "deadline": task["deadline"],
+                        "finish_date": (today + timedelta(days=day_index)).isoformat(),
+                        "days_late": days_late,
+                    }
+                )
+
+        finish_date = today + timedelta(days=day_index) if days else None
+        return {
+            "hours_per_day": hours_per_day,
+            "total_hours": sum(effort for _, _, effort in state.entries.values()),
+            "finish_date": finish_date and finish_date.isoformat(),
+            "days": [
+                {
+                    "date": (today + timedelta(days=index)).isoformat(),
+                    "hours": round(sum(slot["hours"] for slot in slots), 2),
+                    "tasks": slots,
+                }
+                for index, slots in enumerate(days)
+            ],
+            "infeasible": infeasible,
+        }
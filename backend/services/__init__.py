@@ -1,5 +1,17 @@
 from .auth_service import AuthService
+from .profiling_service import ProfilingService
+from .search_service import SearchService
+from .shard_service import ShardService
+from .stats_service import StatsService
 from .subject_service import SubjectService
 from .task_service import TaskService
 
-__all__ = ["AuthService", "TaskService", "SubjectService"]
+__all__ = [
+    "AuthService",
+    "TaskService",
+    "SubjectService",
+    "ShardService",
+    "StatsService",
+    "ProfilingService",
+    "SearchService",
+]
@@ -4,6 +4,8 @@ import jwt
 from config import Config
 from extensions import db
 from models.user import User
+from services.shard_service import ShardService
+from sharding import shard_for_user, use_shard
 from utils.exceptions import AuthError, ValidationError
 from werkzeug.security import check_password_hash, generate_password_hash
 
@@ -24,6 +26,8 @@ class AuthService:
 
         user = User(username=username, password_hash=generate_password_hash(password))
         db.session.add(user)
+        db.session.flush()
+        use_shard(ShardService.assign_shard(user))
         db.session.commit()
         return user
 
@@ -34,6 +38,7 @@ class AuthService:
         if not user or not check_password_hash(user.password_hash, password):
             raise AuthError("Invalid credentials!")
 
+        use_shard(shard_for_user(user))
         return user
 
     @staticmethod
@@ -0,0 +1,42 @@
+from extensions import db
+from models.request_profile import RequestProfile
+from models.slow_query import SlowQuery
+from sqlalchemy import select
+
+
+class ProfilingService:
+    @staticmethod
+    def get_profiles(limit=20):
+        profiles = db.session.scalars(
+            select(RequestProfile).order_by(RequestProfile.id.desc()).limit(limit)
+        )
+        return [
+            {
+                "id": profile.id,
+                "created_at": profile.created_at.isoformat(),
+                "method": profile.method,
+                "path": profile.path,
+                "status_code": profile.status_code,
+                "duration_ms": profile.duration_ms,
+                "frames": profile.frames,
+            }
+            for profile in profiles
+        ]
+
+    @staticmethod
+    def get_slow_queries(limit=50):
+        queries = db.session.scalars(
+            select(SlowQuery).order_by(SlowQuery.id.desc()).limit(limit)
+        )
+        return [
+            {
+                "id": query.id,
+                "created_at": query.created_at.isoformat(),
+                "path": query.path,
+                "duration_ms": query.duration_ms,
+                "statement": query.statement,
+                "parameters": query.parameters,
+                "plan": query.plan,
+            }
+            for query in queries
+        ]
@@ -0,0 +1,85 @@
+import re
+
+from extensions import db
+from models.subject import Subject
+from models.task import Task
+from sqlalchemy import column, func, literal_column, or_, select, table
+
+MAX_QUERY_TERMS = 8
+
+fts_table = table("task_search", column("rowid"))
+tsvector_table = table(
+    "task_search", column("task_id"), column("user_id"), column("document")
+)
+
+
+class SearchService:
+    @staticmethod
+    def search_tasks(user_id, query, page=1, per_page=20):
+        terms = re.findall(r"\w+", query.lower())[:MAX_QUERY_TERMS]
+        if not terms:
+            return [], False
+
+        columns = (
+            Task.id,
+            Task.task_name,
+            Task.subject_id,
+            Subject.name.label("subject_name"),
+            Task.priority,
+            Task.difficulty,
+            Task.deadline,
+            Task.is_completed,
+        )
+        dialect = db.session.get_bind(mapper=Task).dialect.name
+
+        if dialect == "sqlite":
+            # Власник — окремий токен FTS5, тож MATCH одразу звужує до користувача
+            match = (
+                f"owner:u{user_id} AND {{task_name subject_name}}: ("
+                + " ".join(f'"{term}"*' for term in terms)
+                + ")"
+            )
+            rank = func.bm25(literal_column("task_search"), 0.0, 10.0, 3.0)
+            stmt = (
+                select(*columns, (-rank).label("rank"))
+                .select_from(fts_table)
+                .join(Task, Task.id == fts_table.c.rowid)
+                .where(literal_column("task_search").op("MATCH")(match))
+                .order_by(rank)
+            )
+        elif dialect == "postgresql":
+            tsquery = func.to_tsquery(
+                "simple", " & ".join(f"{term}:*" for term in terms)
+            )
+            rank = func.ts_rank(tsvector_table.c.document, tsquery)
+            stmt = (
+                select(*columns, rank.label("rank"))
+                .select_from(tsvector_table)
+                .join(Task, Task.id == tsvector_table.c.task_id)
+                .where(
+                    tsvector_table.c.user_id == user_id,
+                    tsvector_table.c.document.op("@@")(tsquery),
+                )
+                .order_by(rank.desc())
+            )
+        else:
+            # Без нативного індексу — пошук підрядка через LIKE
+            stmt = select(*columns, literal_column("0").label("rank")).select_from(Task)
+            for term in terms:
+                stmt = stmt.where(
+                    or_(
+                        func.lower(Task.task_name).like(f"%{term}%"),
+                        func.lower(Subject.name).like(f"%{term}%"),
+                    )
+                )
+            stmt = stmt.order_by(Task.deadline.asc())
+
+        # Зайвий рядок показує, чи є наступна сторінка, без окремого COUNT
+        rows = db.session.execute(
+            stmt.join(Subject, Subject.id == Task.subject_id)
+            .where(Task.user_id == user_id)
+            .order_by(Task.id.asc())
+            .limit(per_page + 1)
+            .offset((page - 1) * per_page)
+        ).all()
+        return rows[:per_page], len(rows) > per_page
@@ -0,0 +1,183 @@
+import time
+
+from config import Config
+from extensions import db
+from models.user import User
+from models.user_shard import UserShard
+from sharding import hash_shard, shard_for_user, sharded_tables, sharding_enabled
+from sqlalchemy import select, update
+from utils.exceptions import NotFoundError, ValidationError
+
+MOVE_BATCH_SIZE = 1000
+
+
+class ShardService:
+    @staticmethod
+    def assign_shard(user):
+        if not sharding_enabled():
+            return None
+
+        shard_key = hash_shard(user.id)
+        user.shard = UserShard(shard_key=shard_key)
+        # Копія рядка користувача на шарді тримає зовнішні ключі tasks/subjects
+        db.session.execute(
+            User.__table__.insert().values(
+                id=user.id, username=user.username, password_hash=user.password_hash
+            ),
+            bind_arguments={"bind": db.engines[shard_key]},
+        )
+        return shard_key
+
+    @staticmethod
+    def move_user(user_id, target_key):
+        user = db.session.get(User, user_id)
+        if not user:
+            raise NotFoundError("User not found")
+        if target_key not in db.engines:
+            raise ValidationError(f"Unknown shard: {target_key}")
+        if user.shard and user.shard.moving:
+            raise ValidationError("User is already being moved")
+
+        source_key = shard_for_user(user)
+        if source_key == target_key:
+            return {"source": source_key, "target": target_key, "rows": 0}
+
+        # Спершу забороняємо зміни (token_required відповідає 503) і чекаємо,
+        # доки завершаться запити, вже спрямовані на вихідний шард
+        replica = {
+            "id": user.id,
+            "username": user.username,
+            "password_hash": user.password_hash,
+        }
+        if user.shard:
+            user.shard.moving = True
+        else:
+            user.shard = UserShard(shard_key=None, moving=True)
+        db.session.commit()
+        time.sleep(Config.SHARD_MOVE_DRAIN_SECONDS)
+
+        try:
+            rows = ShardService._move_rows(replica, source_key, target_key)
+        except Exception:
+            db.session.rollback()
+            db.session.execute(
+                update(UserShard)
+                .where(UserShard.user_id == user_id)
+                .values(moving=False)
+            )
+            db.session.commit()
+            raise
+
+        return {"source": source_key, "target": target_key, "rows": rows}
+
+    @staticmethod
+    def _move_rows(replica, source_key, target_key):
+        user_id = replica["id"]
+        # Рядки користувача на вихідному шарді заблоковані від копіювання до
+        # видалення: запізнілий запис чекає і завершується помилкою, а не
+        # потрапляє на шард уже після копіювання
+        with db.engines[source_key].begin() as source:
+            ShardService._lock_user_rows(source, user_id)
+
+            # Копіюємо дані на цільовий шард (залишки попередньої невдалої
+            # спроби прибираються), потім перемикаємо довідник і лише після
+            # цього видаляємо дані з вихідного шарда
+            with db.engines[target_key].begin() as target:
+                ShardService._purge_user(target, user_id, target_key)
+                if target_key is not None:
+                    target.execute(User.__table__.insert().values(**replica))
+                rows = ShardService._copy_user_rows(source, target, user_id)
+
+            # Довідник живе в основній БД; якщо вона ж вихідна — та сама транзакція
+            if source_key is None:
+                ShardService._switch_shard(source, user_id, target_key)
+            else:
+                with db.engines[None].begin() as directory:
+                    ShardService._switch_shard(directory, user_id, target_key)
+
+            ShardService._purge_user(source, user_id, source_key)
+
+        return rows
+
+    @staticmethod
+    def _lock_user_rows(conn, user_id):
+        users = User.__table__
+        # FOR UPDATE блокує рядки (PostgreSQL), а порожнє оновлення бере
+        # блокування запису там, де FOR UPDATE немає (SQLite)
+        conn.execute(select(users.c.id).where(users.c.id == user_id).with_for_update())
+        conn.execute(users.update().where(users.c.id == user_id).values(id=users.c.id))
+        for table in sharded_tables(db.metadata):
+            conn.execute(
+                select(*table.primary_key.columns)
+                .where(table.c.user_id == user_id)
+                .with_for_update()
+            )
+
+    @staticmethod
+    def _switch_shard(conn, user_id, target_key):
+        conn.execute(
+            update(UserShard)
+            .where(UserShard.user_id == user_id)
+            .values(shard_key=target_key, moving=False)
+        )
+
+    @staticmethod
+    def _purge_user(conn, user_id, shard_key):
+        for table in reversed(sharded_tables(db.metadata)):
+            conn.execute(table.delete().where(table.c.user_id == user_id))
+        if shard_key is not None:
+            conn.execute(User.__table__.delete().where(User.__table__.c.id == user_id))
+
+    @staticmethod
+    def _copy_user_rows(source, target, user_id):
+        tables = sharded_tables(db.metadata)
+        referenced = {
+            fk.column.table.name for table in tables for fk in table.foreign_keys
+        }
+        # Автоінкрементні id на різних шардах перетинаються, тому рядки
+        # отримують нові id, а зовнішні ключі перевідображаються
+        id_maps = {}
+        copied = 0
+
+        for table in tables:
+            pk_columns = list(table.primary_key.columns)
+            surrogate_pk = (
+                pk_columns[0].name
+                if len(pk_columns) == 1
+                and pk_columns[0].autoincrement in (True, "auto")
+                else None
+            )
+            remaps = {
+                fk.parent.name: fk.column.table.name
+                for fk in table.foreign_keys
+                if fk.column.table.name in id_maps
+            }
+            id_map = id_maps[table.name] = {}
+            batch = []
+
+            rows = source.execute(
+                select(table)
+                .where(table.c.user_id == user_id)
+                .execution_options(yield_per=MOVE_BATCH_SIZE)
+            )
+            for row in rows:
+                values = dict(row._mapping)
+                for column, ref_table in remaps.items():
+                    if values[column] is not None:
+                        values[column] = id_maps[ref_table][values[column]]
+                old_id = values.pop(surrogate_pk) if surrogate_pk else None
+
+                if surrogate_pk and table.name in referenced:
+                    result = target.execute(table.insert().values(**values))
+                    id_map[old_id] = result.inserted_primary_key[0]
+                else:
+                    batch.append(values)
+                    if len(batch) >= MOVE_BATCH_SIZE:
+                        target.execute(table.insert(), batch)
+                        batch = []
+                copied += 1
+
+            if batch:
+                target.execute(table.insert(), batch)
+
+        return copied
@@ -0,0 +1,208 @@
+from collections import defaultdict
+from datetime import date
+
+from extensions import db
+from models.subject import Subject
+from models.subject_stats import SubjectStats
+from models.task import DIFFICULTY_WEIGHTS, Task
+from sqlalchemy import and_, case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+COUNTER_COLUMNS = ("open_count", "completed_count", "open_load")
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class StatsService:
+    @staticmethod
+    def get_stats(user_id):
+        counters = StatsService._counter_rows(user_id)
+        if missing := [row.subject_id for row in counters if row.open_count is None]:
+            # Предмети, створені до появи лічильників, рахуються з tasks один раз
+            try:
+                StatsService._insert_counters(
+                    StatsService._aggregate_query().where(
+                        Subject.user_id == user_id, Subject.id.in_(missing)
+                    )
+                )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            counters = StatsService._counter_rows(user_id)
+
+        # Прострочення залежить від поточної дати, тому рахується запитом
+        # по індексу (user_id, is_completed, deadline)
+        overdue = dict(
+            db.session.execute(
+                select(Task.subject_id, func.count())
+                .filter_by(user_id=user_id, is_completed=False)
+                .where(Task.deadline < date.today())
+                .group_by(Task.subject_id)
+            ).all()
+        )
+
+        return [
+            {
+                "subject_id": row.subject_id,
+                "subject_name": row.name,
+                "open": row.open_count,
+                "completed": row.completed_count,
+                "overdue": overdue.get(row.subject_id, 0),
+                "load": row.open_load,
+            }
+            for row in counters
+        ]
+
+    @staticmethod
+    def task_counters(is_completed, difficulty, sign=1):
+        if is_completed:
+            return {"completed_count": sign}
+        return {"open_count": sign, "open_load": sign * DIFFICULTY_WEIGHTS[difficulty]}
+
+    @staticmethod
+    def record_tasks(user_id, changes):
+        # changes: (subject_id, is_completed, difficulty, sign)
+        deltas = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+        for subject_id, is_completed, difficulty, sign in changes:
+            for column, value in StatsService.task_counters(
+                is_completed, difficulty, sign
+            ).items():
+                deltas[subject_id][column] += value
+
+        for subject_id, delta in deltas.items():
+            StatsService.apply_delta(user_id, subject_id, delta)
+
+    @staticmethod
+    def apply_delta(user_id, subject_id, delta):
+        delta = {column: value for column, value in delta.items() if value}
+        if not delta:
+            return
+
+        stmt = (
+            update(SubjectStats)
+            .where(
+                SubjectStats.user_id == user_id, SubjectStats.subject_id == subject_id
+            )
+            .values(
+                {
+                    column: getattr(SubjectStats, column) + value
+                    for column, value in delta.items()
+                }
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = db.session.execute(stmt)
+        if result.rowcount == 0:
+            # Лічильників ще немає (предмет створено до їх появи) — рахуємо
+            # з таблиці tasks, де вже враховано поточну зміну. Якщо рядок
+            # паралельно вставила інша транзакція, додаємо дельту до нього
+            inserted = StatsService._insert_counters(
+                StatsService._aggregate_query().where(
+                    Subject.user_id == user_id, Subject.id == subject_id
+                )
+            )
+            if inserted.rowcount == 0:
+                db.session.execute(stmt)
+
+    @staticmethod
+    def create_counters(user_id, subject_id):
+        db.session.add(
+            SubjectStats(
+                user_id=user_id,
+                subject_id=subject_id,
+                **dict.fromkeys(COUNTER_COLUMNS, 0),
+            )
+        )
+
+    @staticmethod
+    def delete_counters(user_id, subject_id):
+        db.session.execute(
+            delete(SubjectStats)
+            .where(
+                SubjectStats.user_id == user_id, SubjectStats.subject_id == subject_id
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild(user_id=None):
+        clear = delete(SubjectStats).execution_options(synchronize_session=False)
+        aggregate = StatsService._aggregate_query()
+        if user_id is not None:
+            clear = clear.where(SubjectStats.user_id == user_id)
+            aggregate = aggregate.where(Subject.user_id == user_id)
+
+        try:
+            db.session.execute(clear)
+            result = db.session.execute(
+                insert(SubjectStats).from_select(
+                    ["user_id", "subject_id", *COUNTER_COLUMNS], aggregate
+                )
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return result.rowcount
+
+    @staticmethod
+    def _counter_rows(user_id):
+        return db.session.execute(
+            select(
+                Subject.id.label("subject_id"),
+                Subject.name,
+                SubjectStats.open_count,
+                SubjectStats.completed_count,
+                SubjectStats.open_load,
+            )
+            .select_from(Subject)
+            .outerjoin(
+                SubjectStats,
+                and_(
+                    SubjectStats.subject_id == Subject.id,
+                    SubjectStats.user_id == Subject.user_id,
+                ),
+            )
+            .where(Subject.user_id == user_id)
+            .order_by(Subject.name.asc())
+        ).all()
+
+    @staticmethod
+    def _insert_counters(aggregate):
+        dialect = db.session.get_bind(mapper=SubjectStats).dialect.name
+        stmt = UPSERT_INSERTS.get(dialect, insert)(SubjectStats).from_select(
+            ["user_id", "subject_id", *COUNTER_COLUMNS], aggregate
+        )
+        if dialect in UPSERT_INSERTS:
+            # Наявний рядок не перезаписуємо: конфлікт первинного ключа — не помилка
+            stmt = stmt.on_conflict_do_nothing()
+        return db.session.execute(stmt)
+
+    @staticmethod
+    def _aggregate_query():
+        is_open = Task.is_completed.is_(False)
+        load = case(
+            *[
+                (Task.difficulty == name, weight)
+                for name, weight in DIFFICULTY_WEIGHTS.items()
+            ],
+            else_=0,
+        )
+        return (
+            select(
+                Subject.user_id,
+                Subject.id,
+                func.coalesce(func.sum(case((is_open, 1), else_=0)), 0),
+                func.coalesce(
+                    func.sum(case((Task.is_completed.is_(True), 1), else_=0)), 0
+                ),
+                func.coalesce(func.sum(case((is_open, load), else_=0)), 0),
+            )
+            .select_from(Subject)
+            .outerjoin(
+                Task,
+                and_(Task.subject_id == Subject.id, Task.user_id == Subject.user_id),
+            )
+            .group_by(Subject.user_id, Subject.id)
+        )
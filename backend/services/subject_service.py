@@ -1,7 +1,10 @@
 from extensions import db
 from models.subject import Subject
 from models.task import Task
-from sqlalchemy import and_, func
+from recommendations.planner import StudyPlanner
+from services.stats_service import StatsService
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import aliased
 from utils.exceptions import NotFoundError, ValidationError
 
 
@@ -22,37 +25,67 @@ class SubjectService:
 
         subject = Subject(name=name, user_id=user_id)
         db.session.add(subject)
+        db.session.flush()
+        StatsService.create_counters(user_id, subject.id)
         db.session.commit()
         return subject
 
     @staticmethod
     def update_subject(user_id, subject_id, name):
-        subject = Subject.query.filter_by(id=subject_id, user_id=user_id).first()
-        if not subject:
-            raise NotFoundError("Subject not found")
-
         if not name:
             raise ValidationError("Name is required")
 
-        if Subject.query.filter(
-            and_(
-                func.lower(Subject.name) == func.lower(name),
-                Subject.id != subject_id,
-                Subject.user_id == user_id,
+        # Власник і унікальність назви перевіряються в WHERE самого UPDATE
+        other = aliased(Subject)
+        duplicate = (
+            select(other.id)
+            .where(
+                func.lower(other.name) == func.lower(name),
+                other.id != subject_id,
+                other.user_id == user_id,
             )
-        ).first():
-            raise ValidationError("Subject already exists")
+            .exists()
+        )
+        stmt = (
+            update(Subject)
+            .where(Subject.id == subject_id, Subject.user_id == user_id, ~duplicate)
+            .values(name=name)
+            .execution_options(synchronize_session=False)
+        )
+        owned = select(Subject.id, Subject.name).where(
+            Subject.id == subject_id, Subject.user_id == user_id
+        )
+
+        if db.session.get_bind(mapper=Subject).dialect.update_returning:
+            subject = db.session.execute(
+                stmt.returning(Subject.id, Subject.name)
+            ).first()
+        elif db.session.execute(stmt).rowcount:
+            subject = db.session.execute(owned).first()
+        else:
+            subject = None
+
+        if not subject:
+            if db.session.execute(select(owned.exists())).scalar():
+                raise ValidationError("Subject already exists")
+            raise NotFoundError("Subject not found")
 
-        subject.name = name
         db.session.commit()
+        StudyPlanner.invalidate(user_id)
         return subject
 
     @staticmethod
     def delete_subject(user_id, subject_id):
-        subject = Subject.query.filter_by(id=subject_id, user_id=user_id).first()
-        if not subject:
+        Task.query.filter_by(subject_id=subject_id, user_id=user_id).delete()
+        StatsService.delete_counters(user_id, subject_id)
+        result = db.session.execute(
+            delete(Subject)
+            .where(Subject.id == subject_id, Subject.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
             raise NotFoundError("Subject not found")
 
-        Task.query.filter_by(subject_id=subject_id, user_id=user_id).delete()
-        db.session.delete(subject)
         db.session.commit()
+        StudyPlanner.invalidate(user_id)
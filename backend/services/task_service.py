@@ -1,8 +1,30 @@
+from datetime import date
 
+from config import Config
 from extensions import db
 from models.subject import Subject
 from models.task import Task
-from utils.exceptions import NotFoundError
+from recommendations.planner import StudyPlanner
+from services.stats_service import StatsService
+from sqlalchemy import delete, insert, literal, not_, select, update
+from utils.exceptions import NotFoundError, ValidationError
+from utils.validators import check_task_data
+
+MAX_IMPORT_ERRORS = 100
+TASK_FIELDS = ("task_name", "subject_id", "priority", "difficulty", "deadline")
+PRIORITIES = frozenset(Task.priority.type.enums)
+DIFFICULTIES = frozenset(Task.difficulty.type.enums)
+TASK_NAME_MAX_LENGTH = Task.task_name.type.length
+SUBJECT_NAME_MAX_LENGTH = Subject.name.type.length
+TASK_COLUMNS = (
+    Task.id,
+    Task.task_name,
+    Task.subject_id,
+    Task.priority,
+    Task.difficulty,
+    Task.deadline,
+    Task.is_completed,
+)
 
 
 class TaskService:
@@ -17,51 +39,336 @@ class TaskService:
 
     @staticmethod
     def create_task(user_id, task_data):
-        subject = Subject.query.filter_by(
-            id=task_data["subject_id"], user_id=user_id
-        ).first()
+        # Лише перевірені поля; власник завжди з токена, а не з тіла запиту
+        values = {**TaskService._task_values(task_data), "user_id": user_id}
+        owned_subject = TaskService._owned_subject(user_id, task_data["subject_id"])
+
+        if TaskService._dialect().insert_returning:
+            # INSERT ... SELECT: власник предмета перевіряється в тому ж запиті
+            task = db.session.execute(
+                insert(Task)
+                .from_select(
+                    list(values),
+                    select(
+                        *[
+                            literal(value, Task.__table__.c[key].type)
+                            for key, value in values.items()
+                        ]
+                    ).where(owned_subject),
+                )
+                .returning(*TASK_COLUMNS)
+            ).first()
+        elif db.session.execute(select(owned_subject)).scalar():
+            task = Task(**values)
+            db.session.add(task)
+            db.session.flush()
+        else:
+            task = None
 
-        if not subject:
+        if not task:
             raise NotFoundError("Subject not found or doesn't belong to you")
 
-        task = Task(user_id=user_id, **task_data)
-        db.session.add(task)
+        StatsService.record_tasks(
+            user_id, [(task.subject_id, task.is_completed, task.difficulty, 1)]
+        )
         db.session.commit()
+        StudyPlanner.task_changed(user_id, task.id)
         return task
 
     @staticmethod
     def update_task(user_id, task_id, task_data):
-        task = Task.query.filter_by(id=task_id, user_id=user_id).first()
-        if not task:
-            raise NotFoundError("Task not found")
+        stmt = (
+            update(Task)
+            .where(
+                Task.id == task_id,
+                Task.user_id == user_id,
+                TaskService._owned_subject(user_id, task_data["subject_id"]),
+            )
+            .values(**TaskService._task_values(task_data))
+            .execution_options(synchronize_session=False)
+        )
 
-        subject = Subject.query.filter_by(
-            id=task_data["subject_id"], user_id=user_id
-        ).first()
-        if not subject:
-            raise NotFoundError("Subject not found")
+        if TaskService._dialect().name == "postgresql":
+            # Старі значення для лічильників беруться з рядка, заблокованого
+            # FOR UPDATE в CTE того самого запиту: після паралельного коміту
+            # він повертає нову версію, а не знімок (як самоз'єднання в FROM)
+            old = (
+                TaskService._select_task(
+                    user_id,
+                    task_id,
+                    Task.id,
+                    Task.subject_id,
+                    Task.is_completed,
+                    Task.difficulty,
+                )
+                .with_for_update()
+                .cte("old")
+            )
+            task = db.session.execute(
+                stmt.where(old.c.id == Task.id).returning(
+                    *TASK_COLUMNS,
+                    old.c.subject_id.label("old_subject_id"),
+                    old.c.is_completed.label("old_is_completed"),
+                    old.c.difficulty.label("old_difficulty"),
+                )
+            ).first()
+            before = task and (
+                task.old_subject_id,
+                task.old_is_completed,
+                task.old_difficulty,
+            )
+        else:
+            before = db.session.execute(
+                TaskService._select_task(
+                    user_id,
+                    task_id,
+                    Task.subject_id,
+                    Task.is_completed,
+                    Task.difficulty,
+                ).with_for_update()
+            ).first()
+            task = before and TaskService._execute_returning(stmt, user_id, task_id)
 
-        for key, value in task_data.items():
-            setattr(task, key, value)
+        if not task:
+            # Помилковий шлях: уточнюємо, чого саме бракує
+            if (
+                before
+                or db.session.execute(
+                    select(TaskService._select_task(user_id, task_id, Task.id).exists())
+                ).scalar()
+            ):
+                raise NotFoundError("Subject not found")
+            raise NotFoundError("Task not found")
 
+        StatsService.record_tasks(
+            user_id,
+            [(*before, -1), (task.subject_id, task.is_completed, task.difficulty, 1)],
+        )
         db.session.commit()
+        StudyPlanner.task_changed(user_id, task_id)
         return task
 
     @staticmethod
     def delete_task(user_id, task_id):
-        task = Task.query.filter_by(id=task_id, user_id=user_id).first()
+        stmt = (
+            delete(Task)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        columns = (Task.subject_id, Task.is_completed, Task.difficulty)
+
+        if TaskService._dialect().delete_returning:
+            task = db.session.execute(stmt.returning(*columns)).first()
+        else:
+            task = db.session.execute(
+                TaskService._select_task(user_id, task_id, *columns).with_for_update()
+            ).first()
+            if task:
+                db.session.execute(stmt)
+
         if not task:
             raise NotFoundError("Task not found")
 
-        db.session.delete(task)
+        StatsService.record_tasks(
+            user_id, [(task.subject_id, task.is_completed, task.difficulty, -1)]
+        )
         db.session.commit()
+        StudyPlanner.task_changed(user_id, task_id)
 
     @staticmethod
     def toggle_task_status(user_id, task_id):
-        task = Task.query.filter_by(id=task_id, user_id=user_id).first()
+        # Інверсія в самому UPDATE — без гонки read-modify-write
+        stmt = (
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .values(is_completed=not_(Task.is_completed))
+            .execution_options(synchronize_session=False)
+        )
+        task = TaskService._execute_returning(stmt, user_id, task_id)
         if not task:
             raise NotFoundError("Task not found")
 
-        task.is_completed = not task.is_completed
+        StatsService.record_tasks(
+            user_id,
+            [
+                (task.subject_id, not task.is_completed, task.difficulty, -1),
+                (task.subject_id, task.is_completed, task.difficulty, 1),
+            ],
+        )
         db.session.commit()
+        StudyPlanner.task_changed(user_id, task_id)
         return task
+
+    @staticmethod
+    def _task_values(task_data):
+        return {field: task_data[field] for field in TASK_FIELDS}
+
+    @staticmethod
+    def _dialect():
+        return db.session.get_bind(mapper=Task).dialect
+
+    @staticmethod
+    def _owned_subject(user_id, subject_id):
+        return (
+            select(Subject.id)
+            .where(Subject.id == subject_id, Subject.user_id == user_id)
+            .exists()
+        )
+
+    @staticmethod
+    def _select_task(user_id, task_id, *columns):
+        return select(*columns).where(Task.id == task_id, Task.user_id == user_id)
+
+    @staticmethod
+    def _execute_returning(stmt, user_id, task_id):
+        if TaskService._dialect().update_returning:
+            return db.session.execute(stmt.returning(*TASK_COLUMNS)).first()
+
+        # Без RETURNING: той самий умовний UPDATE і читання вже заблокованого рядка
+        if db.session.execute(stmt).rowcount == 0:
+            return None
+        return db.session.execute(
+            TaskService._select_task(user_id, task_id, *TASK_COLUMNS)
+        ).first()
+
+    @staticmethod
+    def import_tasks(user_id, rows, chunk_size=None):
+        chunk_size = chunk_size or Config.IMPORT_CHUNK_SIZE
+
+        # Одна мапа "назва предмета -> id" на весь імпорт
+        subjects = {
+            name.lower(): subject_id
+            for subject_id, name in db.session.execute(
+                select(Subject.id, Subject.name).where(Subject.user_id == user_id)
+            )
+        }
+        subject_ids = set(subjects.values())
+
+        imported, skipped, errors, chunk = 0, 0, [], []
+        try:
+            for row_no, row in enumerate(rows, start=1):
+                try:
+                    chunk.append(
+                        TaskService._build_import_row(
+                            user_id, row, subjects, subject_ids
+                        )
+                    )
+                except ValidationError as e:
+                    skipped += 1
+                    if len(errors) < MAX_IMPORT_ERRORS:
+                        errors.append({"row": row_no, "error": str(e)})
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    TaskService._insert_import_chunk(user_id, chunk)
+                    imported += len(chunk)
+                    chunk = []
+
+            if chunk:
+                TaskService._insert_import_chunk(user_id, chunk)
+                imported += len(chunk)
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        StudyPlanner.invalidate(user_id)
+        return {"imported": imported, "skipped": skipped, "errors": errors}
+
+    @staticmethod
+    def _insert_import_chunk(user_id, chunk):
+        db.session.execute(Task.__table__.insert(), chunk)
+        StatsService.record_tasks(
+            user_id,
+            [
+                (row["subject_id"], row["is_completed"], row["difficulty"], 1)
+                for row in chunk
+            ],
+        )
+
+    @staticmethod
+    def _build_import_row(user_id, row, subjects, subject_ids):
+        data = {
+            key: value
+            for key, value in row.items()
+            if key in TASK_FIELDS and value not in (None, "")
+        }
+        subject_name = str(row.get("subject_name") or "").strip()
+        if subject_name:
+            # Предмет за назвою визначається після перевірки решти полів
+            data["subject_id"] = None
+
+        if error := check_task_data(data):
+            raise ValidationError(error["error"])
+        if not isinstance(data["deadline"], date):
+            raise ValidationError("Invalid date format. Use YYYY-MM-DD")
+
+        task_name = str(data["task_name"]).strip()
+        if not task_name or len(task_name) > TASK_NAME_MAX_LENGTH:
+            raise ValidationError("Invalid task_name")
+        # Перевірка типу до пошуку в множині: список чи словник не хешуються
+        if not isinstance(data["priority"], str) or data["priority"] not in PRIORITIES:
+            raise ValidationError(f"Invalid priority: {data['priority']}")
+        if (
+            not isinstance(data["difficulty"], str)
+            or data["difficulty"] not in DIFFICULTIES
+        ):
+            raise ValidationError(f"Invalid difficulty: {data['difficulty']}")
+        if len(subject_name) > SUBJECT_NAME_MAX_LENGTH:
+            raise ValidationError("Invalid subject_name")
+
+        is_completed = row.get("is_completed", False)
+        if isinstance(is_completed, str):
+            is_completed = is_completed.strip().lower() in ("true", "1", "yes")
+
+        if subject_name:
+            subject_id = subjects.get(subject_name.lower())
+            if subject_id is None:
+                subject = Subject(name=subject_name, user_id=user_id)
+                db.session.add(subject)
+                db.session.flush()
+                StatsService.create_counters(user_id, subject.id)
+                subject_id = subjects[subject_name.lower()] = subject.id
+                subject_ids.add(subject_id)
+        else:
+            try:
+                subject_id = int(data["subject_id"])
+            except (TypeError, ValueError):
+                raise ValidationError("Invalid subject_id")
+            if subject_id not in subject_ids:
+                raise ValidationError("Subject not found")
+
+        return {
+            "task_name": task_name,
+            "subject_id": subject_id,
+            "priority": data["priority"],
+            "difficulty": data["difficulty"],
+            "deadline": data["deadline"],
+            "is_completed": bool(is_completed),
+            "user_id": user_id,
+        }
+
+    @staticmethod
+    def export_tasks(user_id, batch_size=None):
+        batch_size = batch_size or Config.EXPORT_BATCH_SIZE
+
+        query = (
+            select(
+                Task.id,
+                Task.task_name,
+                Task.subject_id,
+                Subject.name.label("subject_name"),
+                Task.priority,
+                Task.difficulty,
+                Task.deadline,
+                Task.is_completed,
+            )
+            .join(Subject, Task.subject_id == Subject.id)
+            .where(Task.user_id == user_id)
+            .order_by(Task.id.asc())
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+
+        for row in db.session.execute(query):
+            yield row._asdict()
@@ -0,0 +1,69 @@
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import inspect
+from sqlalchemy.sql.util import find_tables
+
+SHARD_BIND_PREFIX = "shard_"
+
+
+class RoutingSession(Session):
+    # Запити до шардованих таблиць (tasks, subjects, ...) спрямовуються на шард
+    # поточного користувача, решта — на базу-довідник за замовчуванням
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            shard_key = g.get("shard_key")
+            if shard_key is not None and _targets_sharded_table(mapper, clause):
+                return self._db.engines[shard_key]
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _targets_sharded_table(mapper, clause):
+    if mapper is not None:
+        return inspect(mapper).local_table.info.get("sharded", False)
+    if clause is not None:
+        return any(
+            table.info.get("sharded", False)
+            for table in find_tables(clause, include_crud=True)
+        )
+    return False
+
+
+def shard_keys():
+    binds = current_app.config.get("SQLALCHEMY_BINDS") or {}
+    return sorted(
+        (key for key in binds if key and key.startswith(SHARD_BIND_PREFIX)),
+        key=lambda key: int(key[len(SHARD_BIND_PREFIX) :]),
+    )
+
+
+def sharding_enabled():
+    return bool(shard_keys())
+
+
+def hash_shard(user_id):
+    keys = shard_keys()
+    return keys[user_id % len(keys)] if keys else None
+
+
+def shard_for_user(user):
+    # None означає базу за замовчуванням (довідник)
+    return user.shard.shard_key if user.shard else None
+
+
+def use_shard(shard_key):
+    g.shard_key = shard_key
+
+
+def sharded_tables(metadata):
+    return [table for table in metadata.sorted_tables if table.info.get("sharded")]
+
+
+def create_shard_schemas(db):
+    tables = [
+        table
+        for table in db.metadata.sorted_tables
+        if table.info.get("sharded") or table.info.get("shard_replica")
+    ]
+    for key in shard_keys():
+        db.metadata.create_all(db.engines[key], tables=tables)
@@ -1,10 +1,12 @@
-from .decorators import token_required
+from .decorators import operator_required, token_required
 from .exceptions import AuthError, NotFoundError, ValidationError
-from .validators import validate_task_data
+from .validators import check_task_data, validate_task_data
 
 __all__ = [
     "token_required",
+    "operator_required",
     "validate_task_data",
+    "check_task_data",
     "NotFoundError",
     "ValidationError",
     "AuthError",
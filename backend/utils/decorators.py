@@ -5,6 +5,11 @@ from config import Config
 from extensions import db
 from flask import jsonify, request
 from models.user import User
+from sharding import shard_for_user, use_shard
+from utils.profiling import is_operator
+
+READ_METHODS = frozenset(("GET", "HEAD"))
+MOVE_RETRY_AFTER = "5"
 
 
 def token_required(f):
@@ -25,8 +30,29 @@ def token_required(f):
             current_user = db.session.get(User, data["user_id"])
             if not current_user:
                 raise ValueError("User not found")
+            if (
+                current_user.shard
+                and current_user.shard.moving
+                and request.method not in READ_METHODS
+            ):
+                return (
+                    jsonify({"error": "Account is being moved, try again shortly"}),
+                    503,
+                    {"Retry-After": MOVE_RETRY_AFTER},
+                )
+            use_shard(shard_for_user(current_user))
             return f(current_user, *args, **kwargs)
         except Exception as e:
             return jsonify({"error": "Token is invalid!", "details": str(e)}), 401
 
     return decorated
+
+
+def operator_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not is_operator():
+            return jsonify({"error": "Operator token is missing or invalid!"}), 403
+        return f(*args, **kwargs)
+
+    return decorated
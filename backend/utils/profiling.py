@@ -0,0 +1,154 @@
+import cProfile
+import hmac
+import pstats
+import random
+import time
+
+from extensions import db
+from flask import current_app, g, has_app_context, has_request_context, request
+from models.request_profile import RequestProfile
+from models.slow_query import SlowQuery
+from sqlalchemy import event, insert
+
+PROFILING_HEADER = "X-Profiling-Token"
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+
+
+def init_profiling(app):
+    # Хуки реєструються лише за потреби, тож вимкнене профілювання нічого не коштує
+    if app.config["PROFILING_TOKEN"] or app.config["PROFILE_SAMPLE_RATE"] > 0:
+        app.before_request(_start_profiler)
+        app.after_request(_stop_profiler)
+
+    if app.config["SLOW_QUERY_THRESHOLD_MS"] > 0:
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+                event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        app.teardown_appcontext(_flush_slow_queries)
+
+
+def is_operator():
+    token = current_app.config["PROFILING_TOKEN"]
+    return bool(token) and hmac.compare_digest(
+        request.headers.get(PROFILING_HEADER, ""), token
+    )
+
+
+def _start_profiler():
+    sample_rate = current_app.config["PROFILE_SAMPLE_RATE"]
+    if not (is_operator() or (sample_rate > 0 and random.random() < sample_rate)):
+        return
+
+    g.profiler = cProfile.Profile()
+    g.profiler_started = time.perf_counter()
+    g.profiler.enable()
+
+
+def _stop_profiler(response):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+
+    profiler.disable()
+    duration_ms = (time.perf_counter() - g.pop("profiler_started")) * 1000
+    _store(
+        RequestProfile,
+        [
+            {
+                "method": request.method,
+                "path": request.full_path.rstrip("?"),
+                "status_code": response.status_code,
+                "duration_ms": duration_ms,
+                "frames": _top_frames(profiler),
+            }
+        ],
+    )
+    return response
+
+
+def _top_frames(profiler):
+    stats = pstats.Stats(profiler).sort_stats("cumulative")
+    frames = []
+    for func in stats.fcn_list[: current_app.config["PROFILE_TOP_FRAMES"]]:
+        primitive_calls, calls, total_time, cumulative_time, _ = stats.stats[func]
+        filename, line, name = func
+        frames.append(
+            {
+                "function": name,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "tottime_ms": total_time * 1000,
+                "cumtime_ms": cumulative_time * 1000,
+            }
+        )
+    return frames
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info.pop("query_started")) * 1000
+    if not has_app_context() or g.get("profiling_store"):
+        return
+    if duration_ms < current_app.config["SLOW_QUERY_THRESHOLD_MS"]:
+        return
+
+    g.setdefault("slow_queries", []).append(
+        {
+            "path": request.path if has_request_context() else None,
+            "duration_ms": duration_ms,
+            "statement": statement,
+            "parameters": _parameters_shape(parameters, executemany),
+            "plan": None if executemany else _explain(conn, statement, parameters),
+        }
+    )
+
+
+def _parameters_shape(parameters, executemany):
+    # Зберігаємо лише типи параметрів, а не самі значення
+    if executemany:
+        return {
+            "rows": len(parameters),
+            "row": _parameters_shape(parameters[0], False) if parameters else None,
+        }
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def _explain(conn, statement, parameters):
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if not prefix or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+
+    # Сирий курсор DBAPI, щоб EXPLAIN не проходив через події SQLAlchemy
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [str(row[-1]) for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+    finally:
+        cursor.close()
+
+
+def _flush_slow_queries(exception=None):
+    if queries := g.pop("slow_queries", None):
+        _store(SlowQuery, queries)
+
+
+def _store(model, rows):
+    # Окреме з'єднання з основною БД, щоб не змішуватися з транзакцією запиту
+    g.profiling_store = True
+    try:
+        with db.engines[None].begin() as conn:
+            conn.execute(insert(model), rows)
+    except Exception:
+        current_app.logger.exception("Failed to store %s", model.__tablename__)
+    finally:
+        g.profiling_store = False
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+from utils.exceptions import ValidationError
+
+TASK_EXPORT_FIELDS = [
+    "id",
+    "task_name",
+    "subject_id",
+    "subject_name",
+    "priority",
+    "difficulty",
+    "deadline",
+    "is_completed",
+]
+
+READ_BUFFER_SIZE = 64 * 1024
+
+FORMAT_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Типи тіла запиту, які імпорт читає напряму (без multipart)
+BODY_MIMETYPES = {
+    **{mime: name for name, mime in FORMAT_MIMETYPES.items()},
+    "application/json": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def resolve_format(fmt=None, content_type=None):
+    if fmt:
+        fmt = fmt.lower()
+    elif content_type:
+        fmt = BODY_MIMETYPES.get(content_type.split(";")[0].strip().lower())
+
+    fmt = fmt or "ndjson"
+    if fmt not in FORMAT_MIMETYPES:
+        raise ValidationError(f"Unsupported format: {fmt}. Use ndjson or csv")
+    return fmt
+
+
+def _decode_lines(stream):
+    # Читаємо потік порядково, не завантажуючи весь файл у пам'ять;
+    # сирий потік запиту буферизуємо, інакше readline читає по байту
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream, READ_BUFFER_SIZE)
+
+    for raw_line in stream:
+        try:
+            yield raw_line.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            raise ValidationError(f"File must be UTF-8 encoded: {e}")
+
+
+def read_task_rows(stream, fmt):
+    lines = _decode_lines(stream)
+
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield {key.strip(): value for key, value in row.items() if key}
+        return
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON on line {line_no}: {e.msg}")
+        if not isinstance(row, dict):
+            raise ValidationError(f"Line {line_no} must be a JSON object")
+        yield row
+
+
+def write_task_rows(rows, fmt):
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=TASK_EXPORT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(
+                {
+                    **row,
+                    "deadline": row["deadline"].isoformat(),
+                    "is_completed": "true" if row["is_completed"] else "false",
+                }
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        yield buffer.getvalue()
+        return
+
+    for row in rows:
+        yield json.dumps(
+            {**row, "deadline": row["deadline"].isoformat()}, ensure_ascii=False
+        ) + "\n"
@@ -3,10 +3,10 @@ from datetime import datetime
 from flask import jsonify
 
 
-def validate_task_data(data):
+def check_task_data(data):
     required_fields = ["task_name", "subject_id", "priority", "difficulty", "deadline"]
     if missing := [field for field in required_fields if field not in data]:
-        return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
+        return {"error": f"Missing fields: {', '.join(missing)}"}
 
     try:
         if isinstance(data["deadline"], str):
@@ -18,11 +18,13 @@ def validate_task_data(data):
                 data["deadline"]["day"],
             ).date()
     except (ValueError, TypeError, KeyError) as e:
-        return (
-            jsonify(
-                {"error": "Invalid date format. Use YYYY-MM-DD", "details": str(e)}
-            ),
-            400,
-        )
+        return {"error": "Invalid date format. Use YYYY-MM-DD", "details": str(e)}
+
+    return None
+
+
+def validate_task_data(data):
+    if error := check_task_data(data):
+        return jsonify(error), 400
 
     return None